@@ -4,16 +4,33 @@ import logging
 import sys
 import time
 from abc import abstractmethod
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
+from types import ModuleType
 from typing import Any, overload
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from .gapi import GAPI, GapiCustomizations
 
 default_logger = getLogger(__name__)
 
+# Modules that have been reloaded by reload_models keyed by the module name. The
+# modification time and size of the source file are stored with the module so the
+# module is only reloaded again when the source file has changed.
+_reloaded_modules: dict[str, tuple[tuple[int, int], ModuleType]] = {}
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(model_class: type[BaseModel]) -> TypeAdapter[list[BaseModel]]:
+    """Get a cached TypeAdapter for a list of models.
+
+    Building a TypeAdapter creates a new pydantic-core schema so it is only done once
+    for each model class.
+    """
+    return TypeAdapter(list[model_class])
+
 
 class AbstractGapiClient:
     logger: logging.Logger = default_logger
@@ -27,15 +44,10 @@ class AbstractGapiClient:
         new_file_path: Path,
         customizations: GapiCustomizations | None = None,
     ) -> None:
-        schema_path = self.schema_path(name)
-        model_path = self.models_path(name)
-
         client = GAPI(name.replace("/", "_"))
-        client.add_schema_from_file(schema_path)
+        client.add_schema_from_file(self.schema_path(name))
         client.add_object_from_file(new_file_path)
-        client.add_customizations(customizations)
-        client.write_json_schema_to_file(schema_path)
-        client.write_pydantic_model_to_file(model_path)
+        self._write_models(name, client, customizations, skip_unchanged=True)
 
     def save_file(
         self,
@@ -64,10 +76,28 @@ class AbstractGapiClient:
         data: BaseModel | list[BaseModel] | list[list[BaseModel]],
     ) -> dict[str, Any] | list[dict[str, Any]] | list[list[dict[str, Any]]]:
         """Dump an API response to a JSON serializable object."""
-        if isinstance(data, list):
-            return [self.dump_response(item) for item in data]
-
-        return data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+        if isinstance(data, BaseModel):
+            return data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+
+        # A list of models of the same class is dumped in one call so pydantic-core
+        # serializes every item instead of calling model_dump once for each item.
+        if data and all(type(item) is type(data[0]) for item in data):
+            model_class = type(data[0])
+            if issubclass(model_class, BaseModel):
+                return _list_adapter(model_class).dump_python(
+                    data,
+                    mode="json",
+                    by_alias=True,
+                    exclude_unset=True,
+                )
+
+        # Models in a list are dumped directly and only nested lists recurse.
+        return [
+            item.model_dump(mode="json", by_alias=True, exclude_unset=True)
+            if isinstance(item, BaseModel)
+            else self.dump_response(item)
+            for item in data
+        ]
 
     def files_path(self) -> Path:
         return self.client_path() / "_files"
@@ -78,20 +108,49 @@ class AbstractGapiClient:
     def models_path(self, name: str) -> Path:
         return self.client_path() / f"{name}/models.py"
 
+    def models_digest_path(self, name: str) -> Path:
+        return self.client_path() / f"{name}/models.digest"
+
     def rebuild_models(
         self,
         name: str,
         customizations: GapiCustomizations | None = None,
     ) -> None:
-        schema_path = self.schema_path(name)
-        model_path = self.models_path(name)
-
         client = GAPI(name.replace("/", "_"))
         client.add_objects_from_folder(self.files_path() / name)
+        self._write_models(name, client, customizations)
+        (self.client_path() / name / "__init__.py").touch()
+
+    def _write_models(
+        self,
+        name: str,
+        client: GAPI,
+        customizations: GapiCustomizations | None = None,
+        *,
+        skip_unchanged: bool = False,
+    ) -> None:
         client.add_customizations(customizations)
+        schema_path = self.schema_path(name)
+        model_path = self.models_path(name)
+
+        # Generating the models is slow so updates skip it when the schema, class name,
+        # and customizations are the same as the last time the models were written.
+        # Rebuilding always writes the models so they can be regenerated after gapi or
+        # its code generation tools are upgraded.
+        digest = client.get_model_cache_key().hex()
+        digest_path = self.models_digest_path(name)
+        if (
+            skip_unchanged
+            and schema_path.exists()
+            and model_path.exists()
+            and digest_path.exists()
+            and digest_path.read_text() == digest
+        ):
+            return
+
         client.write_json_schema_to_file(schema_path)
         client.write_pydantic_model_to_file(model_path)
-        (self.client_path() / name / "__init__.py").touch()
+        digest_path.write_text(digest)
 
     def parse_response[T: BaseModel](
         self,
@@ -99,7 +158,22 @@ class AbstractGapiClient:
         data: dict[str, Any],
         name: str,
         customizations: GapiCustomizations | None = None,
+        *,
+        verify_roundtrip: bool = True,
     ) -> T:
+        """Parse an API response, updating the models if the response does not fit.
+
+        Args:
+            response_model: The model to parse the response with.
+            data: The API response.
+            name: The name of the endpoint.
+            customizations: Customizations to use if the models need to be updated.
+            verify_roundtrip: If True, dump the parsed response and make sure it matches
+                the original response.
+
+        Returns:
+            The parsed response.
+        """
         try:
             parsed = response_model.model_validate(data)
         except ValidationError:
@@ -110,7 +184,11 @@ class AbstractGapiClient:
             if getattr(self, "logger", None):
                 self.logger.info("Updated model %s.", response_model.__name__)
 
-        if self.dump_response(parsed) != data:
+        if not verify_roundtrip:
+            return parsed
+
+        dumped = self.dump_response(parsed)
+        if dumped != data:
             self.save_file(name, data)
             temp_path = self.files_path() / "_temp"
             named_temp_path = temp_path / name
@@ -118,7 +196,7 @@ class AbstractGapiClient:
             original_path = named_temp_path / "original.json"
             parsed_path = named_temp_path / "parsed.json"
             original_path.write_text(json.dumps(data, indent=2))
-            parsed_path.write_text(json.dumps(self.dump_response(parsed), indent=2))
+            parsed_path.write_text(json.dumps(dumped, indent=2))
             msg = "Parsed response does not match original response."
             raise ValueError(msg)
 
@@ -127,15 +205,33 @@ class AbstractGapiClient:
     def reload_models[T: BaseModel](self, model_class: type[T]) -> type[T]:
         """Dynamically reload a model class by reloading its module.
 
+        The module is only reloaded if its source file has changed since the last time
+        it was reloaded.
+
         Returns:
             The reloaded class from the reloaded module
         """
         module = sys.modules[model_class.__module__]
-
+        if not module.__file__:
+            reloaded_module = importlib.reload(module)
+            return getattr(reloaded_module, model_class.__name__)
+
+        source_stat = Path(module.__file__).stat()
+        source_key = (source_stat.st_mtime_ns, source_stat.st_size)
+        cached = _reloaded_modules.get(module.__name__)
+        if cached and cached[0] == source_key and cached[1] is module:
+            return getattr(module, model_class.__name__)
+
+        # The cached bytecode only needs to be removed if it could be older than the
+        # source file.
         if hasattr(module, "__cached__") and module.__cached__:
             cached_path = Path(module.__cached__)
-            if cached_path.exists():
+            if (
+                cached_path.exists()
+                and cached_path.stat().st_mtime_ns <= source_stat.st_mtime_ns
+            ):
                 cached_path.unlink()
 
         reloaded_module = importlib.reload(module)
+        _reloaded_modules[module.__name__] = (source_key, reloaded_module)
         return getattr(reloaded_module, model_class.__name__)
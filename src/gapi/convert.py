@@ -1,7 +1,6 @@
-import contextlib
 import re
-from copy import deepcopy
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from logging import getLogger
 
 from pydantic import TypeAdapter
@@ -10,60 +9,120 @@ from gapi.constants import INPUT_TYPE
 
 default_logger = getLogger(__name__)
 
+# Building a TypeAdapter creates a new pydantic-core schema so they are created once
+# instead of once for every string that is converted.
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+_TIMEDELTA_ADAPTER = TypeAdapter(timedelta)
+
+# Every string that can be converted starts with one of these characters, dates and
+# datetimes start with a digit, a sign or a decimal point, ISO 8601 durations start
+# with "P" and pydantic also accepts durations with an empty hour like ":00:30".
+_CONVERTIBLE_FIRST_CHARACTERS = frozenset("+-.0123456789:P")
+
+_NUMBER_PATTERN = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\Z")
+# Strings are classified with a single match so the right parser can be used directly.
+# datetime.fromisoformat and pydantic parse every string that matches the datetime
+# group the same way so datetime.fromisoformat can be used for the most common datetime
+# formats. Durations can never be datetimes so they skip the datetime validator.
+_VALUE_PATTERN = re.compile(
+    r"(?:(?P<date>\d{4}-\d{2}-\d{2})"
+    r"|(?P<datetime>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?))\Z"
+    r"|(?P<duration>[-+]?P)",
+)
+
 
 def convert_value(value: str) -> str | datetime | date | timedelta:
     """Convert a value to a more specific type if possible.
 
     Returns the converted value if successful, otherwise returns the original string.
     """
+    # Most strings can be ruled out by their first character without running any of
+    # the patterns or validators below.
+    #
     # Do not trust strings that are just integers/floats because it's very easy for them
-    # to be cast to the wrong type.
-    with contextlib.suppress(ValueError):
-        int(value)
+    # to be cast to the wrong type. A pattern is used instead of int() and float() so
+    # strings that are not numbers do not raise exceptions.
+    if (
+        not value
+        or value[0] not in _CONVERTIBLE_FIRST_CHARACTERS
+        or _NUMBER_PATTERN.match(value)
+    ):
         return value
 
-    with contextlib.suppress(ValueError):
-        float(value)
-        return value
+    return _parse_value(value)
+
 
+# JSON data often repeats the same date and datetime strings so parsed values are
+# cached. The cache is bounded so data where every string is different does not use an
+# unbounded amount of memory. The parsed values are immutable so they can be shared.
+@lru_cache(maxsize=8192)
+def _parse_value(value: str) -> str | datetime | date | timedelta:
     # datetime and date basically overlap so extra checks need to be done. The easiest
     # way to do this is to only validate dates of the string matches a date format and
     # assume everything else is a datetime becasue datetime is more complex than dates.
-    if re.fullmatch(r"\d{4}-\d{2}-\d{2}$", value):
-        with contextlib.suppress(ValueError):
-            return TypeAdapter(date).validate_python(value)
-
-    with contextlib.suppress(ValueError):
-        return TypeAdapter(datetime).validate_python(value)
-
-    with contextlib.suppress(ValueError):
-        return TypeAdapter(timedelta).validate_python(value)
-
-    return value
-
+    #
+    # try/except is used instead of contextlib.suppress because this runs for every
+    # string and suppress creates a context manager each time. pydantic's
+    # ValidationError is a subclass of ValueError.
+    match = _VALUE_PATTERN.match(value)
+    kind = match.lastgroup if match else None
+
+    if kind == "date":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    elif kind == "datetime":
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+
+    if kind != "duration":
+        try:
+            return _DATETIME_ADAPTER.validate_python(value)
+        except ValueError:
+            pass
+
+    try:
+        return _TIMEDELTA_ADAPTER.validate_python(value)
+    except ValueError:
+        return value
 
-def _convert_all_values(input_data: INPUT_TYPE) -> None:
-    """Recursively convert all values to more specific types if possible.
 
-    This function modifies the input data in place.
-    """
-    # This code is intentional duplicated for type checking purposes.
+def _shallow_copy(input_data: INPUT_TYPE) -> INPUT_TYPE:
     if isinstance(input_data, dict):
-        for key, value in input_data.items():
-            if isinstance(value, str):
-                input_data[key] = convert_value(value)
-            elif isinstance(value, (dict, list)):
-                _convert_all_values(value)
-    else:
-        for key, value in enumerate(input_data):
-            if isinstance(value, str):
-                input_data[key] = convert_value(value)
-            elif isinstance(value, (dict, list)):
-                _convert_all_values(value)
+        return dict(input_data)
+    return list(input_data)
 
 
 def convert_input_data(input_data: INPUT_TYPE) -> INPUT_TYPE:
-    """Convert all values in the input data to more specific types if possible."""
-    input_data = deepcopy(input_data)
-    _convert_all_values(input_data)
-    return input_data
+    """Convert all values in the input data to more specific types if possible.
+
+    The input data is walked with an explicit stack instead of recursion so deeply
+    nested data does not pay for a function call per container or hit the recursion
+    limit. Each container is shallow copied before it is converted in place so the
+    input data is never modified.
+    """
+    output = _shallow_copy(input_data)
+    stack = [output]
+    while stack:
+        node = stack.pop()
+        # This code is intentional duplicated for type checking purposes.
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, str):
+                    node[key] = convert_value(value)
+                elif isinstance(value, (dict, list)):
+                    node[key] = child = _shallow_copy(value)
+                    stack.append(child)
+        else:
+            for key, value in enumerate(node):
+                if isinstance(value, str):
+                    node[key] = convert_value(value)
+                elif isinstance(value, (dict, list)):
+                    node[key] = child = _shallow_copy(value)
+                    stack.append(child)
+
+    return output
@@ -1,9 +1,43 @@
 import shutil
 import subprocess
+from functools import cache
+
+# Looked up once instead of every time a file is formatted.
+_RUFF_PATH = shutil.which("ruff")
+_UV_PATH = shutil.which("uv")
+
+
+@cache
+def _ruff_command() -> tuple[str, ...]:
+    """Get the command used to run ruff.
+
+    ruff is a dependency of this package so the bundled binary is used directly when
+    it is available, which avoids paying for uv resolving the environment on every
+    call. A ruff binary on the PATH is used next and uv is only used as a last resort.
+
+    Returns:
+        The command used to run ruff.
+    """
+    try:
+        # PLC0415 - ruff is only needed when formatting.
+        from ruff.__main__ import find_ruff_bin  # noqa: PLC0415
+
+        return (find_ruff_bin(),)
+    except (ImportError, FileNotFoundError):
+        pass
+
+    if _RUFF_PATH:
+        return (_RUFF_PATH,)
+
+    if not _UV_PATH:
+        msg = "uv was not found"
+        raise FileNotFoundError(msg)
+
+    return (_UV_PATH, "run", "ruff")
 
 
 def format_with_ruff(content: str) -> str:
-    """Format a Python code string using ruff via uv.
+    """Format a Python code string using ruff.
 
     Args:
         content: The Python code as a string.
@@ -11,12 +45,10 @@ def format_with_ruff(content: str) -> str:
     Returns:
         The formatted Python code as a string.
     """
-    if not shutil.which("uv"):
-        msg = "uv was not found"
-        raise FileNotFoundError(msg)
+    ruff_command = _ruff_command()
 
     check_result = subprocess.run(
-        ["uv", "run", "ruff", "check", "--fix", "--stdin-filename", "temp.py", "-"],  # noqa: S607
+        [*ruff_command, "check", "--fix", "--stdin-filename", "temp.py", "-"],
         input=content,
         text=True,
         capture_output=True,
@@ -28,7 +60,7 @@ def format_with_ruff(content: str) -> str:
         raise RuntimeError(msg)
 
     format_result = subprocess.run(
-        ["uv", "run", "ruff", "format", "--stdin-filename", "temp.py", "-"],  # noqa: S607
+        [*ruff_command, "format", "--stdin-filename", "temp.py", "-"],
         input=check_result.stdout,
         text=True,
         capture_output=True,
@@ -1,8 +1,13 @@
+import hashlib
 import json
-from collections.abc import Sequence
+import re
+import threading
+import tokenize
+from collections import OrderedDict
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+from typing import Any
 
 import datamodel_code_generator
 from degenson import SchemaBuilder
@@ -11,9 +16,81 @@ from pydantic import BaseModel
 from .constants import INPUT_TYPE
 from .convert import convert_input_data
 from .format import format_with_ruff
+from .json_io import find_json_files, load_file, load_files
 
 default_logger = getLogger(__name__)
 
+_CLASS_PATTERN = re.compile(r"class (\w+)\(BaseModel\):")
+_FIELD_PATTERN = re.compile(r"    (\w+):")
+_UNTYPED_LIST_PATTERN = re.compile(r" list\[Any\](?=[ \n])")
+
+# The options passed to datamodel-code-generator that are the same for every model.
+_GENERATE_OPTIONS: dict[str, Any] = {
+    "input_file_type": datamodel_code_generator.InputFileType.JsonSchema,
+    "output_model_type": datamodel_code_generator.DataModelType.PydanticV2BaseModel,
+    "snake_case_field": True,
+    "disable_timestamp": True,
+    "extra_fields": "forbid",
+    "target_python_version": datamodel_code_generator.PythonVersion.PY_313,
+    "output_datetime_class": datamodel_code_generator.DatetimeClassType.Awaredatetime,
+}
+
+# Generated models are shared between GAPI instances because generating a model runs
+# datamodel-code-generator and ruff. The models are keyed by a digest of everything
+# that affects the output so the schemas themselves are not kept in memory. The lock
+# is only held while the cache is read or updated, not while a model is generated.
+_MODEL_CACHE_SIZE = 256
+_model_cache: OrderedDict[bytes, str] = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _to_pascal_case(name: str) -> str:
+    """Convert a snake case name to Pascal case.
+
+    GAPI instances are created repeatedly for the same names so the result is cached.
+    """
+    return name.replace("_", " ").title().replace(" ", "")
+
+
+def _field_end(lines: list[str], start: int) -> int:
+    """Get the index of the last line of the field that starts at start.
+
+    A field continues onto the following lines until all of its brackets are closed.
+    tokenize is used to find where it ends because brackets inside strings, such as an
+    alias, do not count.
+    """
+    readline = iter([f"{line}\n" for line in lines[start:]]).__next__
+    try:
+        for token in tokenize.generate_tokens(readline):
+            if token.type == tokenize.NEWLINE:
+                return start + token.end[0] - 1
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return len(lines) - 1
+
+
+@lru_cache(maxsize=1024)
+def _render_serializer(
+    field_name: str,
+    serializer_code: tuple[str, ...],
+    input_type: str | None,
+    output_type: str | None,
+) -> str:
+    """Render a serializer function.
+
+    Serializers without a class name are rendered once for every class with the field
+    so the rendered function is cached.
+    """
+    return (
+        f'    @field_serializer("{field_name}")\n'
+        f"    def serialize_{field_name}"
+        f"(self, value: {input_type or 'Any'})"
+        f"-> {output_type or 'Any'}:\n"
+        "        "
+        f"{'\n        '.join(serializer_code)}"
+    )
+
 
 class CustomField(BaseModel):
     class_name: str
@@ -38,13 +115,11 @@ class CustomSerializer(BaseModel):
         if isinstance(serializer_code, str):
             serializer_code = serializer_code.split("\n")
 
-        return (
-            f'    @field_serializer("{self.field_name}")\n'
-            f"    def serialize_{self.field_name}"
-            f"(self, value: {self.input_type or 'Any'})"
-            f"-> {self.output_type or 'Any'}:\n"
-            "        "
-            f"{'\n        '.join(serializer_code)}"
+        return _render_serializer(
+            self.field_name,
+            tuple(serializer_code),
+            self.input_type,
+            self.output_type,
         )
 
 
@@ -67,7 +142,7 @@ class GAPI:
 
         self.class_name = None
         if class_name:
-            self.class_name = class_name.replace("_", " ").title().replace(" ", "")
+            self.class_name = _to_pascal_case(class_name)
 
         self.cached_json_schema: str | None = None
         self.cached_pydantic_model: str | None = None
@@ -184,7 +259,7 @@ class GAPI:
             msg = "schema_path must be a file."
             raise ValueError(msg)
 
-        self.add_schema_from_string(schema_path.read_text())
+        self.add_schema_from_dict(load_file(schema_path))
 
     def add_schema_from_string(self, schema_string: str) -> None:
         """Load a JSON schema from a string into the SchemaBuilder.
@@ -222,8 +297,13 @@ class GAPI:
             msg = "folder_path must be a directory."
             raise ValueError(msg)
 
-        for json_file in folder_path.glob(file_pattern):
-            self.add_object_from_file(json_file)
+        if file_pattern == "*.json":
+            json_files = find_json_files(folder_path)
+        else:
+            json_files = list(folder_path.glob(file_pattern))
+
+        for data in load_files(json_files):
+            self.add_object_from_dict(data)
 
     def add_object_from_file(self, file_path: Path) -> None:
         """Load a single JSON object from a file into the SchemaBuilder.
@@ -235,7 +315,7 @@ class GAPI:
             msg = "file_path must be a file."
             raise ValueError(msg)
 
-        self.add_object_from_string(file_path.read_text())
+        self.add_object_from_dict(load_file(file_path))
 
     def add_object_from_string(self, data_string: str) -> None:
         """Load a single JSON object from a string into the SchemaBuilder.
@@ -243,8 +323,7 @@ class GAPI:
         Args:
             data_string: The JSON object as a string.
         """
-        data = json.loads(data_string)
-        self.add_object_from_dict(data)
+        self.add_object_from_dict(json.loads(data_string))
 
     def add_object_from_dict(self, data: INPUT_TYPE) -> None:
         """Load a single JSON object from a dictionary into the SchemaBuilder.
@@ -292,34 +371,95 @@ class GAPI:
         if self.cached_pydantic_model is not None:
             return self.cached_pydantic_model
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as temp_file:
-            temp_path = Path(temp_file.name)
+        json_schema = self.get_json_schema_content()
+        cache_key = self._get_model_cache_key(json_schema)
+        with _model_cache_lock:
+            content = _model_cache.get(cache_key)
+            if content is not None:
+                _model_cache.move_to_end(cache_key)
+
+        if content is None:
+            content = self._generate_pydantic_model_content(json_schema)
+            with _model_cache_lock:
+                _model_cache[cache_key] = content
+                if len(_model_cache) > _MODEL_CACHE_SIZE:
+                    _model_cache.popitem(last=False)
+
+        self.cached_pydantic_model = content
+        return content
+
+    def get_model_cache_key(self) -> bytes:
+        """Get the key the generated model is cached under."""
+        return self._get_model_cache_key(self.get_json_schema_content())
+
+    def _get_model_cache_key(self, json_schema: str) -> bytes:
+        """Get a digest of everything that affects the generated model.
+
+        Args:
+            json_schema: The JSON schema the model is generated from.
+
+        Returns:
+            The digest used as the key for the shared model cache.
+        """
+        customizations = GapiCustomizations(
+            custom_fields=self.replacement_fields,
+            custom_serializers=self.additional_serializers,
+            custom_imports=self.additional_imports,
+        )
+        digest = hashlib.blake2b(digest_size=16)
+        # ruff finds its configuration from the working directory, so models formatted
+        # from different directories are cached separately. The configuration itself is
+        # assumed not to change while the process is running.
+        for part in (
+            json_schema,
+            str(self.class_name),
+            customizations.model_dump_json(),
+            str(Path.cwd()),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+
+    def _generate_pydantic_model_content(self, json_schema: str) -> str:
+        """Generate the Pydantic model content without using any cache.
 
-        datamodel_code_generator.generate(
-            # reportUnknownMemberType - Error is from the library.
-            input_=self.get_json_schema_content(),  # type: ignore[reportUnknownMemberType]
-            output=temp_path,
+        Args:
+            json_schema: The JSON schema to generate the model from.
+
+        Returns:
+            The generated Pydantic model content as a string.
+        """
+        # The model is returned as a string instead of being written to a temporary
+        # file and read back.
+        content = datamodel_code_generator.generate(
+            input_=json_schema,
+            output=None,
             class_name=self.class_name,
-            input_file_type=datamodel_code_generator.InputFileType.JsonSchema,
-            output_model_type=datamodel_code_generator.DataModelType.PydanticV2BaseModel,
-            snake_case_field=True,
-            disable_timestamp=True,
-            extra_fields="forbid",
-            target_python_version=datamodel_code_generator.PythonVersion.PY_313,
-            output_datetime_class=datamodel_code_generator.DatetimeClassType.Awaredatetime,
+            **_GENERATE_OPTIONS,
         )
+        if not isinstance(content, str):
+            msg = "datamodel-code-generator did not generate a single module."
+            raise TypeError(msg)
 
-        content = temp_path.read_text()
-        temp_path.unlink()
         content = format_with_ruff(content)
+        formatted_content = content
         content = self._replace_untyped_lists(content)
-        content = self._apply_additional_imports(content)
-        content = self._apply_replacement_fields(content)
-        content = self._apply_additional_serializers(content)
-        content = format_with_ruff(content)
 
-        self.cached_pydantic_model = content
-        return content
+        # The formatted model can be used as is when nothing else changes it.
+        if (
+            content == formatted_content
+            and not self.replacement_fields
+            and not self.additional_serializers
+            and not self.additional_imports
+        ):
+            return content
+
+        # The remaining steps work on the same list of lines so the model is only split
+        # and joined once.
+        lines = content.splitlines()
+        lines = self._apply_additional_imports(lines)
+        lines = self._apply_customizations(lines)
+        return format_with_ruff("\n".join(lines))
 
     def write_pydantic_model_to_file(self, output_path: Path) -> None:
         """Generate and write the Pydantic model to a file.
@@ -332,134 +472,104 @@ class GAPI:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         output_path.write_text(self.get_pydantic_model_content())
 
-    def _get_all_class_names(self, lines: Sequence[str]) -> list[str]:
-        class_names: list[str] = []
-        for line in lines:
-            if line.strip().startswith("class ") and "(BaseModel):" in line:
-                # Extract class name from "class ClassName(BaseModel):"
-                class_name = line.strip().removeprefix("class ").split("(")[0].strip()
-                class_names.append(class_name)
-        return class_names
+    def _apply_customizations(self, lines: list[str]) -> list[str]:
+        """Apply the replacement fields and serializers in a single pass.
 
-    def _get_class_indexes(
-        self,
-        lines: Sequence[str],
-        class_name: str,
-    ) -> tuple[int, int]:
-        class_line = f"class {class_name}(BaseModel):"
-        start_index = None
-        end_index = None
+        Args:
+            lines: The lines of the generated model content.
 
-        for i, line in enumerate(lines):
-            if class_line == line:
-                start_index = i
-                for j in range(i + 1, len(lines)):
-                    if lines[j].startswith("class"):
-                        end_index = j - 1
-                        break
-                else:
-                    end_index = len(lines) - 1
-                break
+        Returns:
+            The lines of the model content with the customizations applied.
+        """
+        serializer_imports = (
+            "from typing import Any\nfrom pydantic import field_serializer, "
+        )
+        replacement_fields: dict[str, dict[str, CustomField]] = {}
+        for custom_field in self.replacement_fields:
+            class_fields = replacement_fields.setdefault(custom_field.class_name, {})
+            class_fields[custom_field.field_name] = custom_field
+
+        output: list[str] = []
+        i = 0
+        while i < len(lines):
+            class_match = _CLASS_PATTERN.fullmatch(lines[i])
+            if not class_match:
+                # Every line that is not part of a class is before the first class so
+                # this is where the pydantic import is.
+                output.append(
+                    lines[i].replace("from pydantic import ", serializer_imports),
+                )
+                i += 1
+                continue
 
-        if start_index is None or end_index is None:
-            msg = f"Class '{class_name}' not found in the provided lines."
-            raise ValueError(msg)
+            class_name = class_match.group(1)
+            class_end = i + 1
+            while class_end < len(lines) and not lines[class_end].startswith("class"):
+                class_end += 1
 
-        return start_index, end_index
+            body = lines[i + 1 : class_end]
+            for custom_field in replacement_fields.pop(class_name, {}).values():
+                self._replace_field(body, custom_field)
 
-    def _get_field_indexes(
-        self,
-        lines: Sequence[str],
-        class_name: str,
-        field_name: str,
-    ) -> tuple[int, int]:
-        class_start_index, class_end_index = self._get_class_indexes(lines, class_name)
-        start_index = None
-        end_index = None
-        for i in range(class_start_index + 1, class_end_index + 1):
-            line = lines[i]
-            if line.startswith(f"    {field_name}:"):
-                start_index = i
-                end_index = i
-
-                if line.endswith(("(", "[")):
-                    for j in range(i + 1, class_end_index + 1):
-                        end_index = j
-                        if lines[j].endswith((")", "]")):
-                            break
-                break
+            output.append(lines[i])
+            output.extend(self._get_class_serializers(class_name, body))
+            output.extend(body)
+            i = class_end
 
-        if start_index is None or end_index is None:
-            msg = f"Field '{field_name}' not found in the specified class."
+        if replacement_fields:
+            class_name = next(iter(replacement_fields))
+            msg = f"Class '{class_name}' not found in the provided lines."
             raise ValueError(msg)
 
-        return start_index, end_index
+        return output
 
-    def _class_has_field(
-        self,
-        lines: Sequence[str],
-        class_name: str,
-        field_name: str,
-    ) -> bool:
-        start_index, end_index = self._get_class_indexes(lines, class_name)
-
-        for i in range(start_index + 1, end_index + 1):
-            if lines[i].startswith(f"    {field_name}:"):
-                return True
-
-        return False
-
-    def _apply_additional_serializers(self, model_content: str) -> str:
-        model_content = model_content.replace(
-            "from pydantic import ",
-            "from typing import Any\nfrom pydantic import field_serializer, ",
-        )
+    def _replace_field(self, body: list[str], custom_field: CustomField) -> None:
+        field_prefix = f"    {custom_field.field_name}:"
+        for i, line in enumerate(body):
+            if line.startswith(field_prefix):
+                end_index = _field_end(body, i)
+                body[i : end_index + 1] = custom_field.new_field.splitlines()
+                return
 
-        for serializer in self.additional_serializers:
-            if serializer.class_name:
-                class_line = f"class {serializer.class_name}(BaseModel):"
-                replacement = (
-                    class_line + "\n" + serializer.generate_serializer_function()
-                )
-                model_content = model_content.replace(class_line, replacement)
-            # If no class is specified add the serializer to all classes with the field.
-            else:
-                lines = model_content.splitlines()
-                for class_name in self._get_all_class_names(lines):
-                    if self._class_has_field(lines, class_name, serializer.field_name):
-                        class_line = f"class {class_name}(BaseModel):"
-                        replacement = (
-                            class_line
-                            + "\n"
-                            + serializer.generate_serializer_function()
-                        )
-                        model_content = model_content.replace(class_line, replacement)
-
-        return model_content
-
-    def _apply_additional_imports(self, model_content: str) -> str:
-        lines = model_content.splitlines()
+        msg = f"Field '{custom_field.field_name}' not found in the specified class."
+        raise ValueError(msg)
+
+    def _get_class_serializers(self, class_name: str, body: list[str]) -> list[str]:
+        if not self.additional_serializers:
+            return []
+
+        # The fields of the class are only needed for serializers that are added to
+        # every class with a specific field.
+        field_names: set[str] = set()
+        if any(
+            serializer.class_name is None for serializer in self.additional_serializers
+        ):
+            field_names = {
+                field_match.group(1)
+                for line in body
+                if (field_match := _FIELD_PATTERN.match(line))
+            }
+
+        serializers = [
+            serializer.generate_serializer_function()
+            for serializer in self.additional_serializers
+            if serializer.class_name == class_name
+            or (serializer.class_name is None and serializer.field_name in field_names)
+        ]
+        # Each serializer used to be inserted directly after the class definition, so
+        # the most recently added serializer comes first.
+        serializers.reverse()
+        return serializers
+
+    def _apply_additional_imports(self, lines: list[str]) -> list[str]:
         for i, line in enumerate(lines):
             if "#   filename:  <stdin>" in line:
-                for j, import_line in enumerate(self.additional_imports):
-                    lines.insert(i + 2 + j, f"{import_line}\n")
-
-        return "\n".join(lines)
-
-    def _apply_replacement_fields(self, model_content: str) -> str:
-        for custom_field in self.replacement_fields:
-            lines = model_content.splitlines()
-            field_start_index, field_end_index = self._get_field_indexes(
-                lines,
-                custom_field.class_name,
-                custom_field.field_name,
-            )
-
-            lines[field_start_index : field_end_index + 1] = [custom_field.new_field]
-            model_content = "\n".join(lines)
+                lines[i + 2 : i + 2] = [
+                    f"{import_line}\n" for import_line in self.additional_imports
+                ]
+                break
 
-        return model_content
+        return lines
 
     def _replace_untyped_lists(self, model_content: str) -> str:
-        model_content = model_content.replace(" list[Any] ", " list[None] ")
-        return model_content.replace(" list[Any]\n", " list[None]\n")
+        return _UNTYPED_LIST_PATTERN.sub(" list[None]", model_content)
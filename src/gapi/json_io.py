@@ -0,0 +1,92 @@
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+# Starting a thread pool is only worth it when there are enough files to read.
+_MINIMUM_FILES_FOR_THREADS = 8
+
+
+def load_file(path: Path) -> Any:  # noqa: ANN401
+    """Load a JSON file.
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        The loaded JSON data.
+    """
+    return json.loads(path.read_bytes())
+
+
+def find_json_files(folder_path: Path) -> list[Path]:
+    """Find the JSON files directly inside a folder.
+
+    os.scandir is used instead of Path.glob because it does not need to build a Path
+    and match a pattern for every entry and it can check the entry type without an
+    extra stat call.
+
+    Args:
+        folder_path: Path to the folder.
+
+    Returns:
+        Paths to the JSON files in the folder.
+    """
+    with os.scandir(folder_path) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
+
+
+def load_files(paths: Sequence[Path]) -> Iterator[Any]:
+    """Load multiple JSON files.
+
+    The files are yielded one at a time so only a few loaded files are held in memory
+    at once. Each file is independent so larger sets of files are read ahead using a
+    thread pool to overlap the time spent waiting on the disk.
+
+    Args:
+        paths: Paths to the JSON files.
+
+    Returns:
+        An iterator of the loaded JSON data in the same order as paths.
+    """
+    return _map_files(load_file, paths)
+
+
+def read_files(paths: Sequence[Path]) -> Iterator[bytes]:
+    """Read the contents of multiple files.
+
+    The files are read ahead in the same way as load_files.
+
+    Args:
+        paths: Paths to the files.
+
+    Returns:
+        An iterator of the contents of the files in the same order as paths.
+    """
+    return _map_files(Path.read_bytes, paths)
+
+
+def _map_files[T](function: Callable[[Path], T], paths: Sequence[Path]) -> Iterator[T]:
+    if len(paths) < _MINIMUM_FILES_FOR_THREADS:
+        for path in paths:
+            yield function(path)
+        return
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+    pending: deque[Future[T]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for path in paths:
+            pending.append(executor.submit(function, path))
+            # Limit how far ahead files are read so memory use stays bounded.
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -1,9 +1,15 @@
+import hashlib
+import json
+import os
 from logging import Logger, getLogger
 from pathlib import Path
+from typing import Any
 
 from degenson import SchemaBuilder
 
-from .gapi import GAPI
+from .constants import INPUT_TYPE
+from .convert import convert_input_data
+from .json_io import find_json_files, read_files
 
 default_logger = getLogger(__name__)
 
@@ -18,54 +24,92 @@ def recursively_remove_redundant_files(
         root_directory: The root directory containing model subdirectories.
         logger: Logger instance to use for logging redundant files.
     """
-    for model in root_directory.iterdir():
-        if model.name == ".git" or model.is_file():
-            continue
-
-        json_files = list(model.glob("*.json"))
+    # Each directory is only scanned once to find both its JSON files and its
+    # subdirectories.
+    _, directories = _scan_directory(root_directory)
+    while directories:
+        json_files, subdirectories = _scan_directory(directories.pop())
         remove_redundant_files(json_files, logger)
-        recursively_remove_redundant_files(model, logger)
+        directories.extend(subdirectories)
+
+
+def _scan_directory(directory: Path) -> tuple[list[Path], list[Path]]:
+    json_files: list[Path] = []
+    subdirectories: list[Path] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name != ".git":
+                    subdirectories.append(Path(entry.path))
+            elif entry.name.endswith(".json") and entry.is_file():
+                json_files.append(Path(entry.path))
+    return json_files, subdirectories
 
 
 def remove_redundant_files(
     input_files: Path | list[Path],
     logger: Logger = default_logger,
-    complete_schema: SchemaBuilder | None = None,
-    starting_index: int = 0,
 ) -> None:
     """Remove redundant JSON files that produce the same schema.
 
+    Each file is only read, parsed and converted once and the converted objects are
+    reused every time a schema is built without one of the files. Files with the same
+    contents as an earlier file are removed before any schemas are built.
+
     Args:
         input_files: Either a directory containing JSON files or a list of
             JSON file paths.
         logger: Logger instance to use for logging redundant files.
-        complete_schema: The complete schema generated from all input files. If None,
-            it will be generated from input_files.
-        starting_index: The index to start checking for redundant files from.
     """
     if isinstance(input_files, Path):
         if not input_files.is_dir():
             msg = "input_files must be a directory or a list of JSON files."
             raise ValueError(msg)
-        input_files = list(input_files.glob("*.json"))
+        input_files = find_json_files(input_files)
 
-    if complete_schema is None:
-        generator = GAPI()
-        for file in input_files:
-            generator.add_object_from_file(file)
-        complete_schema = generator.builder
+    # A file with the same contents as an earlier file can never add anything to the
+    # schema so it is removed without being parsed. The first copy is kept because
+    # removing a later copy cannot change the order that types are first seen in.
+    unique_files: list[Path] = []
+    objects: list[INPUT_TYPE] = []
+    seen_digests: set[bytes] = set()
+    for input_file, content in zip(input_files, read_files(input_files), strict=True):
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        if digest in seen_digests:
+            logger.info("File %s is redundant", input_file.name)
+            input_file.unlink()
+        else:
+            seen_digests.add(digest)
+            unique_files.append(input_file)
+            objects.append(convert_input_data(json.loads(content)))
+    input_files[:] = unique_files
+
+    # The complete schema is only serialized once instead of every time a partial
+    # schema is compared with it.
+    complete_schema = _build_schema(objects)
 
     # Loop through all of the files while ignoring a specific file each time to make
-    # sure each file is necessary to generate the schema.
-    for i in range(starting_index, len(input_files)):
-        test_files = input_files[:i] + input_files[i + 1 :]
-        generator = GAPI()
-        for file in test_files:
-            generator.add_object_from_file(file)
-        partial_schema = generator.builder
-        if partial_schema == complete_schema:
+    # sure each file is necessary to generate the schema. When a file is removed the
+    # next file takes its index so the index is only advanced when a file is kept.
+    #
+    # The schemas are built from the objects instead of by merging the schema of each
+    # file because a schema does not keep everything the builder knows, for example
+    # an empty object has no required properties in its schema.
+    i = 0
+    while i < len(input_files):
+        if _build_schema(objects[:i] + objects[i + 1 :]) == complete_schema:
             logger.info("File %s is redundant", input_files[i].name)
             input_files[i].unlink()
             input_files.pop(i)
-            remove_redundant_files(input_files, logger, complete_schema, i)
-            return
+            objects.pop(i)
+        else:
+            i += 1
+
+
+def _build_schema(objects: list[INPUT_TYPE]) -> dict[str, Any]:
+    builder = SchemaBuilder()
+    for data in objects:
+        # reportUnknownMemberType - Error is from the library.
+        builder.add_object(data)  # type: ignore[reportUnknownMemberType]
+    # reportUnknownMemberType - Error is from the library.
+    return builder.to_schema()  # type: ignore[reportUnknownMemberType]
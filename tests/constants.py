@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from gapi.constants import MAIN_TYPE
@@ -47,3 +48,8 @@ APPENDED_TEST_DATA: dict[str, MAIN_TYPE] = {
     **TEST_DATA,
     "new_field": "value",
 }
+
+# The test data is written to input files by several tests so it is only serialized
+# once.
+TEST_DATA_JSON = json.dumps(TEST_DATA).encode()
+APPENDED_TEST_DATA_JSON = json.dumps(APPENDED_TEST_DATA).encode()
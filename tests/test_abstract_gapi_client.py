@@ -1,9 +1,13 @@
+import importlib
 import json
 import logging
 import shutil
 from pathlib import Path
 from typing import Any, override
 
+import pytest
+from pydantic import BaseModel, ConfigDict, Field
+
 import gapi
 
 
@@ -74,3 +78,176 @@ def test_run_test() -> None:
     models.TestModel.model_validate({"value": 1})
 
     shutil.rmtree(test_dir)
+
+
+class FolderGapiClient(gapi.AbstractGapiClient):
+    """AbstractGapiClient that keeps all of its files in a folder."""
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+
+    @override
+    def client_path(self) -> Path:
+        return self.folder
+
+
+class TestWriteModels:
+    name = "endpoint"
+
+    @classmethod
+    def build_client(cls, tmp_path: Path) -> tuple[FolderGapiClient, Path]:
+        client = FolderGapiClient(tmp_path)
+        file_path = client.save_file(cls.name, {"value": "string"})
+        client.rebuild_models(cls.name)
+        client.models_path(cls.name).write_text("# unchanged\n")
+        return client, file_path
+
+    def test_update_skips_unchanged_models(self, tmp_path: Path) -> None:
+        client, file_path = self.build_client(tmp_path)
+        client.update_models(self.name, file_path)
+        assert client.models_path(self.name).read_text() == "# unchanged\n"
+
+    def test_update_writes_changed_models(self, tmp_path: Path) -> None:
+        client, _ = self.build_client(tmp_path)
+        file_path = client.save_file(self.name, {"value": 1})
+        client.update_models(self.name, file_path)
+        assert "class Endpoint(BaseModel):" in client.models_path(self.name).read_text()
+
+    def test_rebuild_writes_unchanged_models(self, tmp_path: Path) -> None:
+        client, _ = self.build_client(tmp_path)
+        client.rebuild_models(self.name)
+        assert "class Endpoint(BaseModel):" in client.models_path(self.name).read_text()
+
+
+def test_save_file(tmp_path: Path) -> None:
+    """Large integers and non-string keys are saved the same way json does."""
+    client = FolderGapiClient(tmp_path)
+    file_path = client.save_file("endpoint", {"id": 123456789012345678901234567890})
+    assert json.loads(file_path.read_text()) == {"id": 123456789012345678901234567890}
+
+    file_path = client.save_file("endpoint", {1: "a"})  # type: ignore[reportArgumentType]
+    assert json.loads(file_path.read_text()) == {"1": "a"}
+
+
+class IgnoredFieldModel(BaseModel):
+    value: str
+
+
+def test_mismatched_response_files(tmp_path: Path) -> None:
+    """The debug files are written before the mismatch is raised."""
+    client = FolderGapiClient(tmp_path)
+    data = {"value": "string", "ignored": 1}
+    with pytest.raises(ValueError, match="does not match"):
+        client.parse_response(IgnoredFieldModel, data, "endpoint")
+
+    temp_path = client.files_path() / "_temp" / "endpoint"
+    assert json.loads((temp_path / "original.json").read_bytes()) == data
+    assert json.loads((temp_path / "parsed.json").read_bytes()) == {"value": "string"}
+
+
+class TestReloadModels:
+    @staticmethod
+    def import_model(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        module_name: str,
+    ) -> type[BaseModel]:
+        (tmp_path / f"{module_name}.py").write_text(
+            "from pydantic import BaseModel\n\n\nclass Model(BaseModel):\n"
+            "    value: str\n",
+        )
+        monkeypatch.syspath_prepend(tmp_path)
+        return importlib.import_module(module_name).Model
+
+    def test_reload_changed_models(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        client = FolderGapiClient(tmp_path)
+        model = client.reload_models(
+            self.import_model(tmp_path, monkeypatch, "reload_changed_models"),
+        )
+
+        (tmp_path / "reload_changed_models.py").write_text(
+            "from pydantic import BaseModel\n\n\nclass Model(BaseModel):\n"
+            "    value: str\n    new_value: int\n",
+        )
+        reloaded_model = client.reload_models(model)
+
+        assert reloaded_model is not model
+        assert "new_value" in reloaded_model.model_fields
+
+    def test_skip_reloading_unchanged_models(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        client = FolderGapiClient(tmp_path)
+        model = client.reload_models(
+            self.import_model(tmp_path, monkeypatch, "reload_unchanged_models"),
+        )
+
+        assert client.reload_models(model) is model
+
+
+class AliasedModel(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    item_id: int = Field(alias="itemId")
+    note: str | None = None
+
+
+class ExtendedAliasedModel(AliasedModel):
+    extra_note: str = "default"
+
+
+class OtherModel(BaseModel):
+    name: str
+
+
+def dump_each(data: Any) -> Any:  # noqa: ANN401
+    """Dump models one at a time the way dump_response is expected to."""
+    if isinstance(data, BaseModel):
+        return data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    return [dump_each(item) for item in data]
+
+
+class TestDumpResponse:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(
+                [AliasedModel(item_id=1), AliasedModel(itemId=2, note="x")],
+                id="same_type",
+            ),
+            pytest.param(
+                [AliasedModel(item_id=1), OtherModel(name="a")],
+                id="mixed_types",
+            ),
+            pytest.param(
+                [AliasedModel(item_id=1), ExtendedAliasedModel(item_id=2)],
+                id="subclass",
+            ),
+            pytest.param([], id="empty"),
+            pytest.param(
+                [
+                    [AliasedModel(item_id=1), AliasedModel(item_id=2, note=None)],
+                    [OtherModel(name="a")],
+                    [],
+                ],
+                id="nested",
+            ),
+        ],
+    )
+    def test_dump_list(self, data: list[Any]) -> None:
+        client = FolderGapiClient(Path())
+        assert client.dump_response(data) == dump_each(data)
+
+    def test_dump_same_type_list_uses_aliases_and_excludes_unset(self) -> None:
+        client = FolderGapiClient(Path())
+        data = [AliasedModel(item_id=1), AliasedModel(item_id=2, note=None)]
+        assert client.dump_response(data) == [
+            {"itemId": 1},
+            {"itemId": 2, "note": None},
+        ]
@@ -26,6 +26,21 @@ class TestConvert:
         """Test converting timedelta strings in dict."""
         assert isinstance(convert_value("string"), str)
 
+    @pytest.mark.parametrize("value", ["1", "-1", "+1", "1.0", "1.", ".5", "1e5"])
+    def test_convert_number(self, value: str) -> None:
+        """Test that strings that are numbers are not converted."""
+        assert convert_value(value) == value
+
+    @pytest.mark.parametrize("value", ["-P1D", "+PT1H", "-1:00:00", ":00:30", "1 day"])
+    def test_convert_signed_or_numeric_timedelta(self, value: str) -> None:
+        """Test that timedelta strings that do not start with P are converted."""
+        assert isinstance(convert_value(value), timedelta)
+
+    @pytest.mark.parametrize("value", ["", "p1d", "now", " 2024-01-15"])
+    def test_convert_unconvertible_first_character(self, value: str) -> None:
+        """Test that strings that cannot start a date or duration are not converted."""
+        assert convert_value(value) == value
+
 
 class TestConvertEverything:
     @pytest.mark.parametrize(
@@ -1,13 +1,15 @@
 import json
-from copy import deepcopy
+from functools import cache
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
 import gapi
+from gapi.gapi import _field_end  # type: ignore[reportPrivateUsage]
 from tests.constants import (
     APPENDED_TEST_DATA,
+    APPENDED_TEST_DATA_JSON,
     MODEL_CUSTOM_FIELD_MULTIPLE_LINES_PATH,
     MODEL_CUSTOM_FIELD_SINGLE_LINE_PATH,
     MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH,
@@ -19,8 +21,24 @@ from tests.constants import (
     SCHEMA_UPDATED_NO_CONVERT_PATH,
     SCHEMA_UPDATED_PATH,
     TEST_DATA,
+    TEST_DATA_JSON,
 )
 
+if TYPE_CHECKING:
+    from gapi.constants import MAIN_TYPE
+
+
+@cache
+def read_expected(path: Path) -> str:
+    """Read an expected output file once and reuse it for every test."""
+    return path.read_text()
+
+
+@cache
+def load_expected_json(path: Path) -> Any:  # noqa: ANN401
+    """Parse an expected JSON file once and reuse it for every comparison."""
+    return json.loads(read_expected(path))
+
 
 def test_generate_all_expected_files() -> None:
     """Helper function to regenerate all expected files."""
@@ -63,8 +81,7 @@ class TestGenerateJsonSchema:
         expected_path = SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
         # reportUnknownMemberType - Error is from the library.
         output = schema.builder.to_json()  # type: ignore[reportUnknownMemberType]
-        expected_output = json.loads(expected_path.read_text())
-        assert json.loads(output) == expected_output
+        assert json.loads(output) == load_expected_json(expected_path)
 
     @staticmethod
     def validate_updated_output(schema: gapi.GAPI, *, convert: bool) -> None:
@@ -73,164 +90,140 @@ class TestGenerateJsonSchema:
         )
         # reportUnknownMemberType - Error is from the library.
         output = schema.builder.to_json()  # type: ignore[reportUnknownMemberType]
-        expected_output = json.loads(expected_path.read_text())
-        assert json.loads(output) == expected_output
+        assert json.loads(output) == load_expected_json(expected_path)
 
     @pytest.mark.parametrize("convert", [True, False])
-    def test_generate_using_file(self, *, convert: bool) -> None:
+    def test_generate_using_file(self, tmp_path: Path, *, convert: bool) -> None:
         """Test generating JSON schema from a JSON file."""
-        with NamedTemporaryFile(mode="w", suffix=".json", delete=False) as file:
-            json.dump(TEST_DATA, file)
-            input_file = Path(file.name)
-        try:
-            generator = gapi.GAPI(convert=convert)
-            generator.add_object_from_file(input_file)
-            TestGenerateJsonSchema.validate_output(generator, convert=convert)
-        finally:
-            input_file.unlink()
+        input_file = tmp_path / "input.json"
+        input_file.write_bytes(TEST_DATA_JSON)
+
+        generator = gapi.GAPI(convert=convert)
+        generator.add_object_from_file(input_file)
+        TestGenerateJsonSchema.validate_output(generator, convert=convert)
 
     @pytest.mark.parametrize("convert", [True, False])
-    def test_generate_using_multiple_files(self, *, convert: bool) -> None:
+    def test_generate_using_multiple_files(
+        self,
+        tmp_path: Path,
+        *,
+        convert: bool,
+    ) -> None:
         """Test generating JSON schema from a JSON file."""
-        with NamedTemporaryFile(mode="w", suffix=".json", delete=False) as file:
-            json.dump(TEST_DATA, file)
-            input_file = Path(file.name)
-        try:
-            generator = gapi.GAPI(convert=convert)
-            generator.add_object_from_file(input_file)
-            generator.add_object_from_file(input_file)
-            TestGenerateJsonSchema.validate_output(generator, convert=convert)
-        finally:
-            input_file.unlink()
+        input_file = tmp_path / "input.json"
+        input_file.write_bytes(TEST_DATA_JSON)
+
+        generator = gapi.GAPI(convert=convert)
+        generator.add_object_from_file(input_file)
+        generator.add_object_from_file(input_file)
+        TestGenerateJsonSchema.validate_output(generator, convert=convert)
 
     @pytest.mark.parametrize("convert", [True, False])
     def test_update_using_file(
         self,
+        tmp_path: Path,
         *,
         convert: bool,
     ) -> None:
-        with NamedTemporaryFile(mode="w", suffix=".json", delete=False) as file:
-            json.dump(APPENDED_TEST_DATA, file)
-            input_file = Path(file.name)
-        try:
-            generator = gapi.GAPI(convert=convert)
-            existing_schema_path = SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
-            generator.add_schema_from_file(existing_schema_path)
+        input_file = tmp_path / "input.json"
+        input_file.write_bytes(APPENDED_TEST_DATA_JSON)
 
-            generator.add_object_from_file(input_file)
-            TestGenerateJsonSchema.validate_updated_output(
-                generator,
-                convert=convert,
-            )
+        generator = gapi.GAPI(convert=convert)
+        existing_schema_path = SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
+        generator.add_schema_from_file(existing_schema_path)
 
-        finally:
-            input_file.unlink()
+        generator.add_object_from_file(input_file)
+        TestGenerateJsonSchema.validate_updated_output(
+            generator,
+            convert=convert,
+        )
 
     class TestUsingFolder:
         @pytest.mark.parametrize("convert", [True, False])
-        def test_generate_using_folder(self, *, convert: bool) -> None:
+        def test_generate_using_folder(self, tmp_path: Path, *, convert: bool) -> None:
             """Test generating JSON schema from a folder of JSON files."""
-            with TemporaryDirectory() as tmpdir_str:
-                tmpdir = Path(tmpdir_str)
+            for i in range(3):
+                file_path = tmp_path / f"{i}.json"
+                file_path.write_bytes(TEST_DATA_JSON)
 
-                for i in range(3):
-                    file_path = tmpdir / f"{i}.json"
-                    file_path.write_text(json.dumps(TEST_DATA))
-
-                generator = gapi.GAPI(convert=convert)
-                generator.add_objects_from_folder(tmpdir)
-                TestGenerateJsonSchema.validate_output(
-                    generator,
-                    convert=convert,
-                )
+            generator = gapi.GAPI(convert=convert)
+            generator.add_objects_from_folder(tmp_path)
+            TestGenerateJsonSchema.validate_output(
+                generator,
+                convert=convert,
+            )
 
         @pytest.mark.parametrize("convert", [True, False])
         def test_update_using_folder(
             self,
+            tmp_path: Path,
             *,
             convert: bool,
         ) -> None:
             """Test updating existing schema with new data from folder."""
-            with TemporaryDirectory() as tmpdir_str:
-                tmpdir = Path(tmpdir_str)
-
-                for i in range(3):
-                    file_path = tmpdir / f"{i}.json"
-                    file_path.write_text(json.dumps(APPENDED_TEST_DATA))
+            for i in range(3):
+                file_path = tmp_path / f"{i}.json"
+                file_path.write_bytes(APPENDED_TEST_DATA_JSON)
 
-                generator = gapi.GAPI(convert=convert)
+            generator = gapi.GAPI(convert=convert)
 
-                existing_schema_path = (
-                    SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
-                )
-                generator.add_schema_from_file(existing_schema_path)
+            existing_schema_path = SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
+            generator.add_schema_from_file(existing_schema_path)
 
-                generator.add_objects_from_folder(tmpdir)
-                TestGenerateJsonSchema.validate_updated_output(
-                    generator,
-                    convert=convert,
-                )
+            generator.add_objects_from_folder(tmp_path)
+            TestGenerateJsonSchema.validate_updated_output(
+                generator,
+                convert=convert,
+            )
 
     class TestUsingListOfFiles:
         @pytest.mark.parametrize("convert", [True, False])
-        def test_generate_using_list_of_files(self, *, convert: bool) -> None:
+        def test_generate_using_list_of_files(
+            self,
+            tmp_path: Path,
+            *,
+            convert: bool,
+        ) -> None:
             """Test generating JSON schema from a list of JSON files."""
             files: list[Path] = []
-            try:
-                for _ in range(3):
-                    with NamedTemporaryFile(
-                        mode="w",
-                        suffix=".json",
-                        delete=False,
-                    ) as file:
-                        json.dump(TEST_DATA, file)
-                        files.append(Path(file.name))
-
-                generator = gapi.GAPI(convert=convert)
-                for file_path in files:
-                    generator.add_object_from_file(file_path)
-                TestGenerateJsonSchema.validate_output(
-                    generator,
-                    convert=convert,
-                )
-            finally:
-                for file in files:
-                    file.unlink()
+            for i in range(3):
+                file_path = tmp_path / f"{i}.json"
+                file_path.write_bytes(TEST_DATA_JSON)
+                files.append(file_path)
+
+            generator = gapi.GAPI(convert=convert)
+            for file_path in files:
+                generator.add_object_from_file(file_path)
+            TestGenerateJsonSchema.validate_output(
+                generator,
+                convert=convert,
+            )
 
         @pytest.mark.parametrize("convert", [True, False])
         def test_update_using_list_of_files(
             self,
+            tmp_path: Path,
             *,
             convert: bool,
         ) -> None:
             """Test updating existing schema with new data from list of files."""
             files: list[Path] = []
-            try:
-                for _ in range(3):
-                    with NamedTemporaryFile(
-                        mode="w",
-                        suffix=".json",
-                        delete=False,
-                    ) as file:
-                        json.dump(APPENDED_TEST_DATA, file)
-                        files.append(Path(file.name))
-
-                generator = gapi.GAPI(convert=convert)
-
-                existing_schema_path = (
-                    SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
-                )
-                generator.add_schema_from_file(existing_schema_path)
-
-                for file_path in files:
-                    generator.add_object_from_file(file_path)
-                TestGenerateJsonSchema.validate_updated_output(
-                    generator,
-                    convert=convert,
-                )
-            finally:
-                for file in files:
-                    file.unlink()
+            for i in range(3):
+                file_path = tmp_path / f"{i}.json"
+                file_path.write_bytes(APPENDED_TEST_DATA_JSON)
+                files.append(file_path)
+
+            generator = gapi.GAPI(convert=convert)
+
+            existing_schema_path = SCHEMA_PATH if convert else SCHEMA_NO_CONVERT_PATH
+            generator.add_schema_from_file(existing_schema_path)
+
+            for file_path in files:
+                generator.add_object_from_file(file_path)
+            TestGenerateJsonSchema.validate_updated_output(
+                generator,
+                convert=convert,
+            )
 
 
 class TestGeneratePydanticModel:
@@ -238,25 +231,21 @@ class TestGeneratePydanticModel:
         """Test generating Pydantic model from JSON schema file."""
         generator = gapi.GAPI()
         generator.add_schema_from_file(SCHEMA_PATH)
-        assert generator.get_pydantic_model_content() == MODEL_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(MODEL_PATH)
 
     def test_generate_from_schema_dict(self) -> None:
         """Test generating Pydantic model from JSON schema dict."""
         generator = gapi.GAPI()
-        generator.add_schema_from_dict(json.loads(SCHEMA_PATH.read_text()))
-        assert generator.get_pydantic_model_content() == MODEL_PATH.read_text()
+        generator.add_schema_from_dict(json.loads(read_expected(SCHEMA_PATH)))
+        assert generator.get_pydantic_model_content() == read_expected(MODEL_PATH)
 
-    def test_write_to_file(self) -> None:
+    def test_write_to_file(self, tmp_path: Path) -> None:
         """Test writing Pydantic model to file."""
-        with NamedTemporaryFile(suffix=".py", delete=False) as file:
-            output_file = Path(file.name)
-        try:
-            generator = gapi.GAPI()
-            generator.add_object_from_dict(TEST_DATA)
-            generator.write_pydantic_model_to_file(output_file)
-            assert output_file.read_text() == MODEL_PATH.read_text()
-        finally:
-            output_file.unlink()
+        output_file = tmp_path / "models.py"
+        generator = gapi.GAPI()
+        generator.add_object_from_dict(TEST_DATA)
+        generator.write_pydantic_model_to_file(output_file)
+        assert output_file.read_text() == read_expected(MODEL_PATH)
 
     def test_datetime_string_and_none(self) -> None:
         """Test generating Pydantic model from JSON schema file."""
@@ -284,17 +273,18 @@ class TestCustomFields:
             field_name="field_datetime",
             new_field="field_datetime: AwareDatetime",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_FIELD_SINGLE_LINE_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_FIELD_SINGLE_LINE_PATH,
         )
 
     def test_apply_multiple_line_customization(
         self,
     ) -> None:
         """Test applying GAPI customizations to a Pydantic model file."""
-        test_data = deepcopy(TEST_DATA)
-        test_data["FieldNameThatIsLongWithMultipleLines"] = "String"
+        test_data: dict[str, MAIN_TYPE] = {
+            **TEST_DATA,
+            "FieldNameThatIsLongWithMultipleLines": "String",
+        }
 
         generator = gapi.GAPI()
         generator.add_object_from_dict(test_data)
@@ -303,10 +293,53 @@ class TestCustomFields:
             field_name="field_name_that_is_long_with_multiple_lines",
             new_field="field_name_that_is_long_with_multiple_lines: str",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_FIELD_MULTIPLE_LINES_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_FIELD_MULTIPLE_LINES_PATH,
+        )
+
+    def test_apply_customization_with_bracket_in_alias(self) -> None:
+        """Test that brackets inside an alias do not hide the fields after it."""
+        generator = gapi.GAPI()
+        generator.add_object_from_dict({"price (usd": 1, "after": "s", "z_last": 2})
+        generator.add_replacement_field(
+            class_name="Model",
+            field_name="price__usd",
+            new_field='price__usd: float = Field(..., alias="price (usd")',
+        )
+        lines = generator.get_pydantic_model_content().splitlines()
+        assert '    price__usd: float = Field(..., alias="price (usd")' in lines
+        assert "    after: str" in lines
+        assert "    z_last: int" in lines
+
+    def test_apply_customization_to_optional_multiple_line_field(self) -> None:
+        """Test replacing a multiple line field that ends with a default value."""
+        field_name = (
+            "a_very_long_field_name_that_needs_wrapping_for_the_list_type_annotation"
         )
+        generator = gapi.GAPI(convert=False)
+        generator.add_object_from_dict({field_name: [True, 1.5, "a"], "after": "s"})
+        generator.add_object_from_dict({"after": "s"})
+        generator.add_replacement_field(
+            class_name="Model",
+            field_name=field_name,
+            new_field=f"{field_name}: str | None = None",
+        )
+        content = generator.get_pydantic_model_content()
+        assert "list[" not in content
+        assert "    after: str" in content.splitlines()
+
+    @pytest.mark.parametrize(
+        ("lines", "end"),
+        [
+            (["    a: int", "    b: int"], 0),
+            (['    a: int = Field(..., alias="a (")', "    b: int"], 0),
+            (["    a: list[", "        int | None", "    ] = None", "    b: int"], 2),
+            (["    a: str = Field(", '        alias="a)",', "    )", "    b: int"], 2),
+        ],
+    )
+    def test_field_end(self, lines: list[str], end: int) -> None:
+        """Test finding the last line of a field."""
+        assert _field_end(lines, 0) == end
 
 
 class TestCustomSerializers:
@@ -322,9 +355,8 @@ class TestCustomSerializers:
             "return value.strftime(strf_string)",
             class_name="Model",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH,
         )
 
     def test_add_list_serializer(
@@ -341,9 +373,8 @@ class TestCustomSerializers:
             ],
             class_name="Model",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH,
         )
 
     def test_add_typed_serializer(
@@ -362,9 +393,8 @@ class TestCustomSerializers:
             output_type="str",
             class_name="Model",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_TYPED_SERIALIZER_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_TYPED_SERIALIZER_PATH,
         )
 
     def test_add_serializer_to_all_classes(
@@ -378,9 +408,8 @@ class TestCustomSerializers:
             serializer_code='strf_string ="%Y-%m-%dT%H:%M:%S.%f"\n'
             "return value.strftime(strf_string)",
         )
-        assert (
-            generator.get_pydantic_model_content()
-            == MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH.read_text()
+        assert generator.get_pydantic_model_content() == read_expected(
+            MODEL_CUSTOM_MULTIPLE_LINE_SERIALIZER_PATH,
         )
 
 
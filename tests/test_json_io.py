@@ -0,0 +1,17 @@
+import math
+from pathlib import Path
+
+from gapi.json_io import load_file
+
+
+class TestLoadFile:
+    def test_load_large_integer(self, tmp_path: Path) -> None:
+        """Integers that do not fit in 64 bits are still loaded as integers."""
+        path = tmp_path / "large.json"
+        path.write_text('{"id": 123456789012345678901234567890}')
+        assert load_file(path) == {"id": 123456789012345678901234567890}
+
+    def test_load_nan(self, tmp_path: Path) -> None:
+        path = tmp_path / "nan.json"
+        path.write_text('{"value": NaN}')
+        assert math.isnan(load_file(path)["value"])
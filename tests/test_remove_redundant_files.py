@@ -1,24 +1,74 @@
-import json
 from pathlib import Path
-from tempfile import TemporaryDirectory
 
 import gapi
 from tests.constants import (
-    TEST_DATA,
+    TEST_DATA_JSON,
 )
 
 
 class TestRemoveRedundantFiles:
-    def test_remove_redundant_files(self) -> None:
+    def test_remove_redundant_files(self, tmp_path: Path) -> None:
         number_of_files = 3
-        with TemporaryDirectory() as tmpdir_str:
-            tmpdir = Path(tmpdir_str)
+        for i in range(number_of_files):
+            file_path = tmp_path / f"{i}.json"
+            file_path.write_bytes(TEST_DATA_JSON)
 
-            for i in range(number_of_files):
-                file_path = tmpdir / f"{i}.json"
-                file_path.write_text(json.dumps(TEST_DATA))
+        gapi.remove_redundant_files(tmp_path)
 
-            gapi.remove_redundant_files(tmpdir)
+        remaining_files = list(tmp_path.glob("*.json"))
+        assert len(remaining_files) == 1
 
-            remaining_files = list(tmpdir.glob("*.json"))
-            assert len(remaining_files) == 1
+    def test_keep_file_with_empty_object(self, tmp_path: Path) -> None:
+        """An empty object makes its properties optional so its file is needed."""
+        (tmp_path / "a.json").write_bytes(b'{"meta": {"id": 1}}')
+        (tmp_path / "b.json").write_bytes(b'{"meta": {}}')
+
+        gapi.remove_redundant_files(tmp_path)
+
+        remaining_files = sorted(path.name for path in tmp_path.glob("*.json"))
+        assert remaining_files == ["a.json", "b.json"]
+
+    def test_remove_different_redundant_file(self, tmp_path: Path) -> None:
+        """Different values with the same types only need one file."""
+        (tmp_path / "a.json").write_bytes(b'{"id": 1, "name": "a"}')
+        (tmp_path / "b.json").write_bytes(b'{"id": 2, "name": "b"}')
+
+        gapi.remove_redundant_files(tmp_path)
+
+        remaining_files = list(tmp_path.glob("*.json"))
+        assert len(remaining_files) == 1
+
+    def test_keep_different_files(self, tmp_path: Path) -> None:
+        """Files that each add a type or a property are all needed."""
+        (tmp_path / "a.json").write_bytes(b'{"id": 1}')
+        (tmp_path / "b.json").write_bytes(b'{"id": "1"}')
+        (tmp_path / "c.json").write_bytes(b'{"name": "c"}')
+
+        gapi.remove_redundant_files(tmp_path)
+
+        remaining_files = sorted(path.name for path in tmp_path.glob("*.json"))
+        assert remaining_files == ["a.json", "b.json", "c.json"]
+
+    def test_remove_redundant_file_from_list(self, tmp_path: Path) -> None:
+        """Only the files that add nothing to the schema are removed from the list."""
+        files = [tmp_path / f"{i}.json" for i in range(3)]
+        files[0].write_bytes(b'{"id": 1}')
+        files[1].write_bytes(b'{"id": 1, "name": "b"}')
+        files[2].write_bytes(b'{"id": null}')
+
+        gapi.remove_redundant_files(files)
+
+        assert [path.name for path in files] == ["1.json", "2.json"]
+        assert not (tmp_path / "0.json").exists()
+
+    def test_keep_first_identical_file(self, tmp_path: Path) -> None:
+        """Only the first of several files with the same contents is kept."""
+        files = [tmp_path / f"{i}.json" for i in range(3)]
+        files[0].write_bytes(b'{"id": 1}')
+        files[1].write_bytes(b'{"id": "1"}')
+        files[2].write_bytes(b'{"id": 1}')
+
+        gapi.remove_redundant_files(files)
+
+        assert [path.name for path in files] == ["0.json", "1.json"]
+        assert not (tmp_path / "2.json").exists()